@@ -4,6 +4,7 @@ Google Workspace OAuth Scopes
 This module centralizes OAuth scope definitions for Google Workspace integration.
 Separated from service_decorator.py to avoid circular imports.
 """
+import functools
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,6 +12,10 @@ logger = logging.getLogger(__name__)
 # Global variable to store enabled tools (set by main.py)
 _ENABLED_TOOLS = None
 
+# Scopes for the enabled tools as an immutable tuple, computed on first use and
+# reset by set_enabled_tools. Also backs the module-level SCOPES attribute.
+_CACHED_CURRENT_SCOPES = None
+
 # Individual OAuth Scope Constants
 USERINFO_EMAIL_SCOPE = 'https://www.googleapis.com/auth/userinfo.email'
 USERINFO_PROFILE_SCOPE = 'https://www.googleapis.com/auth/userinfo.profile'
@@ -42,41 +47,41 @@ CONTACTS_SCOPE = 'https://www.googleapis.com/auth/contacts'
 CONTACTS_READONLY_SCOPE = 'https://www.googleapis.com/auth/contacts.readonly'
 
 # Base OAuth scopes required for user identification
-BASE_SCOPES = [
+BASE_SCOPES = frozenset({
     USERINFO_EMAIL_SCOPE,
     USERINFO_PROFILE_SCOPE,
     OPENID_SCOPE
-]
+})
 
-CALENDAR_SCOPES = [
+CALENDAR_SCOPES = frozenset({
     CALENDAR_SCOPE,
     CALENDAR_READONLY_SCOPE,
     CALENDAR_EVENTS_SCOPE
-]
+})
 
-DRIVE_SCOPES = [
+DRIVE_SCOPES = frozenset({
     DRIVE_SCOPE,
     DRIVE_READONLY_SCOPE,
     DRIVE_FILE_SCOPE
-]
+})
 
-GMAIL_SCOPES = [
+GMAIL_SCOPES = frozenset({
     GMAIL_READONLY_SCOPE,
     GMAIL_SEND_SCOPE,
     GMAIL_COMPOSE_SCOPE,
     GMAIL_MODIFY_SCOPE,
     GMAIL_LABELS_SCOPE
-]
+})
 
-TASKS_SCOPES = [
+TASKS_SCOPES = frozenset({
     TASKS_SCOPE,
     TASKS_READONLY_SCOPE
-]
+})
 
-CONTACTS_SCOPES = [
+CONTACTS_SCOPES = frozenset({
     CONTACTS_SCOPE,
     CONTACTS_READONLY_SCOPE
-]
+})
 
 # Tool-to-scopes mapping
 TOOL_SCOPES_MAP = {
@@ -87,41 +92,66 @@ TOOL_SCOPES_MAP = {
     'contacts': CONTACTS_SCOPES
 }
 
+_ALL_TOOLS = frozenset(TOOL_SCOPES_MAP)
+
+@functools.lru_cache(maxsize=32)
+def _scopes_for_tool_set(enabled_tools):
+    """
+    Returns the cached scope union for a frozenset of tool names.
+    
+    Args:
+        enabled_tools: Frozenset of tool names. Unknown names are ignored.
+    
+    Returns:
+        Frozenset of scopes for the given tools plus base scopes.
+    """
+    return BASE_SCOPES.union(*(TOOL_SCOPES_MAP[tool] for tool in enabled_tools & _ALL_TOOLS))
+
 def set_enabled_tools(enabled_tools):
     """
     Set the globally enabled tools list.
+    Unknown tool names are dropped with a warning and duplicates are collapsed.
     
     Args:
-        enabled_tools: List of enabled tool names.
+        enabled_tools: List of enabled tool names, or None for all tools.
     """
-    global _ENABLED_TOOLS
-    _ENABLED_TOOLS = enabled_tools
-    logger.info(f"Enabled tools set for scope management: {enabled_tools}")
+    global _ENABLED_TOOLS, _CACHED_CURRENT_SCOPES
+    if enabled_tools is None:
+        _ENABLED_TOOLS = None
+    else:
+        requested_tools = frozenset(enabled_tools)
+        unknown_tools = requested_tools - _ALL_TOOLS
+        if unknown_tools:
+            logger.warning("Ignoring unknown tools for scope management: %s", sorted(unknown_tools))
+        _ENABLED_TOOLS = requested_tools & _ALL_TOOLS
+    _CACHED_CURRENT_SCOPES = None
+    logger.info("Enabled tools set for scope management: %s", enabled_tools)
 
 def get_current_scopes():
     """
     Returns scopes for currently enabled tools.
     Uses globally set enabled tools or all tools if not set.
     
+    The scopes are cached until set_enabled_tools is called again; each call
+    returns a fresh list so callers can't alter the cached value.
+    
     Returns:
         List of unique scopes for the enabled tools plus base scopes.
     """
+    global _CACHED_CURRENT_SCOPES
+    if _CACHED_CURRENT_SCOPES is not None:
+        return list(_CACHED_CURRENT_SCOPES)
+
     enabled_tools = _ENABLED_TOOLS
     if enabled_tools is None:
         # Default behavior - return all scopes
-        enabled_tools = TOOL_SCOPES_MAP.keys()
+        enabled_tools = _ALL_TOOLS
     
-    # Start with base scopes (always required)
-    scopes = BASE_SCOPES.copy()
+    scopes = _scopes_for_tool_set(enabled_tools)
     
-    # Add scopes for each enabled tool
-    for tool in enabled_tools:
-        if tool in TOOL_SCOPES_MAP:
-            scopes.extend(TOOL_SCOPES_MAP[tool])
-    
-    logger.debug(f"Generated scopes for tools {list(enabled_tools)}: {len(set(scopes))} unique scopes")
-    # Return unique scopes
-    return list(set(scopes))
+    logger.debug("Generated scopes for tools %s: %d unique scopes", enabled_tools, len(scopes))
+    _CACHED_CURRENT_SCOPES = tuple(scopes)
+    return list(_CACHED_CURRENT_SCOPES)
 
 def get_scopes_for_tools(enabled_tools=None):
     """
@@ -137,16 +167,15 @@ def get_scopes_for_tools(enabled_tools=None):
         # Default behavior - return all scopes
         enabled_tools = TOOL_SCOPES_MAP.keys()
     
-    # Start with base scopes (always required)
-    scopes = BASE_SCOPES.copy()
-    
-    # Add scopes for each enabled tool
-    for tool in enabled_tools:
-        if tool in TOOL_SCOPES_MAP:
-            scopes.extend(TOOL_SCOPES_MAP[tool])
-    
-    # Return unique scopes
-    return list(set(scopes))
+    return list(_scopes_for_tool_set(frozenset(enabled_tools)))
+
+def __getattr__(name):
+    """
+    Lazily resolves the module-level SCOPES attribute (PEP 562).
 
-# Combined scopes for all supported Google Workspace operations (backwards compatibility)
-SCOPES = get_scopes_for_tools()
\ No newline at end of file
+    SCOPES is kept for backwards compatibility and reflects the scopes for the
+    currently enabled tools, computed on first access.
+    """
+    if name == "SCOPES":
+        return get_current_scopes()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
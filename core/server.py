@@ -15,7 +15,8 @@ from auth.google_auth import handle_auth_callback, start_auth_flow, check_client
 from auth.mcp_session_middleware import MCPSessionMiddleware
 from auth.oauth_responses import create_error_response, create_success_response, create_server_error_response
 from auth.auth_info_middleware import AuthInfoMiddleware
-from auth.scopes import SCOPES, get_current_scopes # noqa
+from auth.scopes import get_current_scopes
+from core.utils import install_orjson_for_google_api
 from core.config import (
     USER_GOOGLE_EMAIL,
     get_transport_mode,
@@ -26,6 +27,11 @@ from core.config import (
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Parse Google API responses with orjson (a CPython-only dependency) for every
+# googleapiclient service in the process; request bodies and other interpreters
+# keep the stdlib json module. Done at startup, before any tool builds a service.
+install_orjson_for_google_api()
+
 _auth_provider: Optional[GoogleProvider] = None
 _legacy_callback_registered = False
 
@@ -1,4 +1,5 @@
 import io
+import json
 import logging
 import os
 import zipfile
@@ -7,7 +8,13 @@ import ssl
 import asyncio
 import functools
 
-from typing import List, Optional
+from typing import Any, List, Optional
+
+# orjson is only a dependency on CPython; fall back to the stdlib json module elsewhere
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from googleapiclient.errors import HttpError
 from .api_enablement import get_api_enablement_message
@@ -322,3 +329,63 @@ def handle_http_errors(tool_name: str, is_read_only: bool = False, service_type:
         return wrapper
 
     return decorator
+
+
+class _OrjsonCompat:
+    """
+    json-module stand-in that routes loads through orjson and delegates everything else.
+
+    dumps deliberately stays on the stdlib: googleapiclient sends request bodies as str
+    and sizes them by character count, so they must keep json.dumps' ASCII escaping.
+    """
+
+    def __init__(self, orjson_module, json_module):
+        self._orjson = orjson_module
+        self._json = json_module
+
+    def loads(self, content, **kwargs):
+        if kwargs:
+            return self._json.loads(content, **kwargs)
+        return self._orjson.loads(content)
+
+    def __getattr__(self, name):
+        return getattr(self._json, name)
+
+
+def install_orjson_for_google_api() -> bool:
+    """
+    Makes googleapiclient's JSON model parse responses with orjson when it is installed.
+    Request bodies are still serialized with the stdlib json module.
+
+    orjson is a dependency on CPython only; on other interpreters the stdlib json
+    module stays in place. The override applies to every googleapiclient service
+    in the process, not just the tools that asked for it.
+
+    Returns:
+        bool: True if orjson was installed into googleapiclient.model, False otherwise.
+    """
+    if orjson is None:
+        logger.debug("orjson not available; Google API responses use the stdlib json module")
+        return False
+
+    from googleapiclient import model
+
+    if not isinstance(model.json, _OrjsonCompat):
+        model.json = _OrjsonCompat(orjson, json)
+        logger.info("Using orjson for Google API response parsing")
+    return True
+
+
+def dumps_json(obj: Any) -> str:
+    """
+    Serializes tool output to a compact JSON string, using orjson when it is available.
+
+    Not for Google API request bodies: non-ASCII characters are left unescaped.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode("utf-8")
+        except TypeError:
+            # orjson rejects some inputs the stdlib accepts (e.g. non-str keys)
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
@@ -6,20 +6,79 @@ This module provides MCP tools for interacting with the Google Contacts API.
 
 import logging
 import asyncio
-from typing import Optional, Dict, Any
+import time
+from collections import OrderedDict
+from typing import Optional, List, Dict, Any, Literal, Tuple
+
+from googleapiclient.errors import HttpError
 
 from auth.service_decorator import require_google_service
-from core.utils import handle_http_errors
+from core.utils import handle_http_errors, dumps_json
 from core.server import server
 from auth.scopes import CONTACTS_READONLY_SCOPE, CONTACTS_SCOPE
 
 # Configure module logger
 logger = logging.getLogger(__name__)
 
+CONTACTS_BATCH_SIZE = 25
+CONTACTS_REQUEST_DELAY = 0.1
+
+# Person fields returned by searches and batch updates (readMask)
+CONTACT_READ_MASK = "names,emailAddresses,phoneNumbers"
+# Person fields read before appending an email (the etag is always returned)
+EMAIL_UPDATE_GET_FIELDS = "emailAddresses"
+# Person fields written when appending an email
+EMAIL_UPDATE_FIELDS = "emailAddresses"
+ETAG_CACHE_TTL_SECONDS = 60
+ETAG_CACHE_MAX_ENTRIES = 1000
+
+# (user_google_email, resource_name) -> (etag, emailAddresses, expiry time).
+# Every write moves the entry to the end with the same TTL, so entries are
+# ordered by expiry and the oldest ones are swept or evicted from the front.
+_ETAG_CACHE: "OrderedDict[Tuple[str, str], Tuple[str, List[Dict[str, Any]], float]]" = OrderedDict()
+
+def _cache_contact(user_google_email: str, person: Dict[str, Any]) -> None:
+    """Remembers a contact's etag and email addresses from an API response."""
+    resource_name = person.get("resourceName")
+    etag = person.get("etag")
+    if not (resource_name and etag):
+        return
+
+    now = time.monotonic()
+    # Sweep expired entries from the front
+    while _ETAG_CACHE and next(iter(_ETAG_CACHE.values()))[2] <= now:
+        _ETAG_CACHE.popitem(last=False)
+
+    key = (user_google_email, resource_name)
+    _ETAG_CACHE[key] = (etag, person.get("emailAddresses", []), now + ETAG_CACHE_TTL_SECONDS)
+    _ETAG_CACHE.move_to_end(key)
+
+    # Evict the oldest entries beyond the size cap
+    while len(_ETAG_CACHE) > ETAG_CACHE_MAX_ENTRIES:
+        _ETAG_CACHE.popitem(last=False)
+
+def _get_cached_contact(
+    user_google_email: str, resource_name: str
+) -> Optional[Tuple[str, List[Dict[str, Any]]]]:
+    """Returns a cached (etag, emailAddresses) pair for a contact, or None if missing or expired."""
+    key = (user_google_email, resource_name)
+    entry = _ETAG_CACHE.get(key)
+    if entry is None:
+        return None
+    etag, email_addresses, expires_at = entry
+    if time.monotonic() >= expires_at:
+        _ETAG_CACHE.pop(key, None)
+        return None
+    return etag, email_addresses
+
+def _is_etag_mismatch(error: HttpError) -> bool:
+    """Checks whether an update was rejected because the contact's etag is stale."""
+    status = error.resp.status
+    return status == 412 or (status == 400 and b"FAILED_PRECONDITION" in (error.content or b""))
+
 # Helper function to format contact details for output
 def _format_contact_details(person: Dict[str, Any]) -> str:
     """Formats a person object from the Contacts API into a readable string."""
-    details = []
     resource_name = person.get("resourceName", "N/A")
     names = person.get("names", [])
     emails = person.get("emailAddresses", [])
@@ -29,21 +88,24 @@ def _format_contact_details(person: Dict[str, Any]) -> str:
     if names:
         display_name = names[0].get("displayName", "No Name")
 
-    details.append(f"- Name: \"{display_name}\" (Resource Name: {resource_name})")
+    email_text = ", ".join(e.get("value", "N/A") for e in emails) if emails else "None"
+    phone_text = ", ".join(p.get("value", "N/A") for p in phone_numbers) if phone_numbers else "None"
 
-    if emails:
-        email_list = [f"{e.get('value', 'N/A')}" for e in emails]
-        details.append(f"  Emails: {', '.join(email_list)}")
-    else:
-        details.append("  Emails: None")
+    return (
+        f"- Name: \"{display_name}\" (Resource Name: {resource_name})\n"
+        f"  Emails: {email_text}\n"
+        f"  Phone Numbers: {phone_text}"
+    )
 
-    if phone_numbers:
-        phone_list = [f"{p.get('value', 'N/A')}" for p in phone_numbers]
-        details.append(f"  Phone Numbers: {', '.join(phone_list)}")
-    else:
-        details.append("  Phone Numbers: None")
-        
-    return "\n".join(details)
+def _contact_to_dict(person: Dict[str, Any]) -> Dict[str, Any]:
+    """Extracts the resource name, display name, emails and phone numbers from a person object."""
+    names = person.get("names", [])
+    return {
+        "resourceName": person.get("resourceName"),
+        "name": names[0].get("displayName") if names else None,
+        "emails": [e.get("value") for e in person.get("emailAddresses", [])],
+        "phones": [p.get("value") for p in person.get("phoneNumbers", [])],
+    }
 
 @server.tool()
 @handle_http_errors("search_contacts", is_read_only=True, service_type="contacts")
@@ -53,6 +115,7 @@ async def search_contacts(
     user_google_email: str,
     query: str,
     page_size: int = 10,
+    format: Literal["text", "json"] = "text",
 ) -> str:
     """
     Searches for contacts by name or email address.
@@ -61,25 +124,28 @@ async def search_contacts(
         user_google_email (str): The user's Google email address. Required.
         query (str): The name or email to search for.
         page_size (int): The maximum number of contacts to return. Defaults to 10.
+        format (Literal["text", "json"]): Output format. "text" returns a readable list, "json" returns a JSON array of contacts with resourceName, name, emails and phones.
 
     Returns:
-        str: A formatted list of found contacts with their names, emails, and resource names.
+        str: A formatted list of found contacts with their names, emails, and resource names, or a JSON array when format is "json".
     """
-    logger.info(f"[search_contacts] Invoked. Email: '{user_google_email}', Query: '{query}'")
-
-    # The readMask specifies which fields to return for each person.
-    # Add 'phoneNumbers' to the read_mask to retrieve phone numbers.
-    read_mask = "names,emailAddresses,phoneNumbers"
+    logger.info("[search_contacts] Invoked. Email: '%s', Query: '%s'", user_google_email, query)
 
     response = await asyncio.to_thread(
-        lambda: service.people().searchContacts(
+        service.people().searchContacts(
             query=query,
             pageSize=page_size,
-            readMask=read_mask
-        ).execute()
+            readMask=CONTACT_READ_MASK
+        ).execute
     )
 
     results = response.get("results", [])
+    for res in results:
+        _cache_contact(user_google_email, res.get("person", {}))
+
+    if format == "json":
+        return dumps_json([_contact_to_dict(res.get("person", {})) for res in results])
+
     if not results:
         return f"No contacts found matching '{query}' for {user_google_email}."
 
@@ -91,6 +157,107 @@ async def search_contacts(
     )
     return output
 
+@server.tool()
+@handle_http_errors("search_contacts_batch", is_read_only=True, service_type="contacts")
+@require_google_service("contacts", CONTACTS_READONLY_SCOPE)
+async def search_contacts_batch(
+    service,
+    user_google_email: str,
+    queries: List[str],
+    page_size: int = 10,
+) -> str:
+    """
+    Runs multiple contact searches by name or email address using batch requests.
+    Queries are sent in batches of up to 25, one batch request at a time. If a batch
+    request fails, its queries are retried one by one.
+
+    Args:
+        user_google_email (str): The user's Google email address. Required.
+        queries (List[str]): The names or emails to search for.
+        page_size (int): The maximum number of contacts to return per query. Defaults to 10.
+
+    Returns:
+        str: Found contacts grouped by query, with their names, emails, and resource names.
+    """
+    logger.info("[search_contacts_batch] Invoked. Email: '%s', Queries: '%s'", user_google_email, queries)
+
+    if not queries:
+        raise Exception("No queries provided")
+
+    people = service.people()
+    output_sections = []
+
+    for chunk_start in range(0, len(queries), CONTACTS_BATCH_SIZE):
+        chunk_queries = queries[chunk_start : chunk_start + CONTACTS_BATCH_SIZE]
+        results: Dict[str, Dict] = {}
+
+        def _batch_callback(request_id, response, exception):
+            """Callback for batch requests"""
+            results[request_id] = {"data": response, "error": exception}
+
+        # Try to use batch API
+        try:
+            batch = service.new_batch_http_request(callback=_batch_callback)
+            for offset, query in enumerate(chunk_queries):
+                batch.add(
+                    people.searchContacts(
+                        query=query,
+                        pageSize=page_size,
+                        readMask=CONTACT_READ_MASK
+                    ),
+                    request_id=str(chunk_start + offset),
+                )
+
+            # All searches in the chunk share one HTTP round-trip
+            await asyncio.to_thread(batch.execute)
+
+        except Exception as batch_error:
+            # Fall back to sequential requests for the queries the batch didn't answer
+            logger.warning(
+                "[search_contacts_batch] Batch API failed, falling back to sequential processing: %s",
+                batch_error,
+            )
+            for offset, query in enumerate(chunk_queries):
+                request_id = str(chunk_start + offset)
+                if request_id in results:
+                    continue
+                try:
+                    response = await asyncio.to_thread(
+                        people.searchContacts(
+                            query=query,
+                            pageSize=page_size,
+                            readMask=CONTACT_READ_MASK
+                        ).execute
+                    )
+                    results[request_id] = {"data": response, "error": None}
+                except Exception as e:
+                    results[request_id] = {"data": None, "error": e}
+                # Brief delay between requests to allow connection cleanup
+                await asyncio.sleep(CONTACTS_REQUEST_DELAY)
+
+        for offset, query in enumerate(chunk_queries):
+            entry = results.get(str(chunk_start + offset), {"data": None, "error": "No result"})
+            if entry["error"]:
+                output_sections.append(f"⚠️ Query '{query}': {entry['error']}")
+                continue
+
+            matches = (entry["data"] or {}).get("results", [])
+            for res in matches:
+                _cache_contact(user_google_email, res.get("person", {}))
+            if not matches:
+                output_sections.append(f"No contacts found matching '{query}'.")
+                continue
+
+            output_sections.append(
+                f"Found {len(matches)} contacts matching '{query}':\n"
+                + "\n".join(_format_contact_details(res.get("person", {})) for res in matches)
+            )
+
+    return (
+        f"Contact search results for {user_google_email} ({len(queries)} queries):\n\n"
+        + "\n\n".join(output_sections)
+    )
+
 @server.tool()
 @handle_http_errors("create_contact", service_type="contacts")
 @require_google_service("contacts", CONTACTS_SCOPE)
@@ -115,22 +282,20 @@ async def create_contact(
     Returns:
         str: Confirmation message with the new contact's details.
     """
-    logger.info(f"[create_contact] Invoked. Email: '{user_google_email}', Name: '{given_name} {family_name}'")
+    logger.info("[create_contact] Invoked. Email: '%s', Name: '%s %s'", user_google_email, given_name, family_name)
 
+    name = {"givenName": given_name, "familyName": family_name} if family_name else {"givenName": given_name}
     person_body = {
-        "names": [{"givenName": given_name, "familyName": family_name or ""}],
+        "names": [name],
+        **({"emailAddresses": [{"value": email}]} if email else {}),
+        **({"phoneNumbers": [{"value": phone_number}]} if phone_number else {}),
     }
 
-    if email:
-        person_body["emailAddresses"] = [{"value": email}]
-    
-    if phone_number:
-        person_body["phoneNumbers"] = [{"value": phone_number}]
-
     created_person = await asyncio.to_thread(
-        lambda: service.people().createContact(body=person_body).execute()
+        service.people().createContact(body=person_body).execute
     )
 
+    _cache_contact(user_google_email, created_person)
     formatted_details = _format_contact_details(created_person)
     return f"Successfully created contact for {user_google_email}:\n{formatted_details}"
 
@@ -154,34 +319,125 @@ async def update_contact_email(
     Returns:
         str: Confirmation message with the updated contact's details.
     """
-    logger.info(f"[update_contact_email] Invoked. Email: '{user_google_email}', Resource: '{resource_name}'")
-
-    # First, get the contact's current state to retrieve the etag
-    person_to_update = await asyncio.to_thread(
-        lambda: service.people().get(
-            resourceName=resource_name,
-            personFields="names,emailAddresses"
-        ).execute()
-    )
-    
-    etag = person_to_update.get("etag")
-    if not etag:
-        raise Exception("Could not retrieve etag for contact. Update failed.")
+    logger.info("[update_contact_email] Invoked. Email: '%s', Resource: '%s'", user_google_email, resource_name)
 
-    # Prepare the update body
-    person_body = {
-        "etag": etag,
-        "emailAddresses": person_to_update.get("emailAddresses", []) + [{"value": email}]
-    }
+    people = service.people()
+    cached = _get_cached_contact(user_google_email, resource_name)
+    while True:
+        if cached is not None:
+            etag, email_addresses = cached
+        else:
+            # Get the contact's current state to retrieve the etag
+            person_to_update = await asyncio.to_thread(
+                people.get(
+                    resourceName=resource_name,
+                    personFields=EMAIL_UPDATE_GET_FIELDS
+                ).execute
+            )
 
-    updated_person = await asyncio.to_thread(
-        lambda: service.people().updateContact(
-            resourceName=resource_name,
-            updatePersonFields="emailAddresses",
-            body=person_body
-        ).execute()
-    )
+            etag = person_to_update.get("etag")
+            if not etag:
+                raise Exception("Could not retrieve etag for contact. Update failed.")
+            email_addresses = person_to_update.get("emailAddresses", [])
+
+        # Prepare the update body
+        person_body = {
+            "etag": etag,
+            "emailAddresses": email_addresses + [{"value": email}]
+        }
+
+        try:
+            updated_person = await asyncio.to_thread(
+                people.updateContact(
+                    resourceName=resource_name,
+                    updatePersonFields=EMAIL_UPDATE_FIELDS,
+                    body=person_body
+                ).execute
+            )
+        except HttpError as error:
+            # Whatever went wrong (stale etag, deleted contact, ...), the entry can't be trusted
+            _ETAG_CACHE.pop((user_google_email, resource_name), None)
+            if cached is None or not _is_etag_mismatch(error):
+                raise
+            # The cached etag is stale; retry once with a fresh read
+            logger.info("[update_contact_email] Cached etag for '%s' is stale, refetching.", resource_name)
+            cached = None
+            continue
+        break
 
+    _cache_contact(user_google_email, updated_person)
     formatted_details = _format_contact_details(updated_person)
     return f"Successfully updated contact for {user_google_email}:\n{formatted_details}"
 
+
+@server.tool()
+@handle_http_errors("batch_update_contact_emails", service_type="contacts")
+@require_google_service("contacts", CONTACTS_SCOPE)
+async def batch_update_contact_emails(
+    service,
+    user_google_email: str,
+    updates: Dict[str, str],
+) -> str:
+    """
+    Adds an email address to multiple contacts using one batch read and one batch update request.
+    Use search_contacts first to get the resourceNames.
+
+    Args:
+        user_google_email (str): The user's Google email address. Required.
+        updates (Dict[str, str]): Mapping of contact resource name (e.g., 'people/c12345') to the email address to add. Max 200 entries.
+
+    Returns:
+        str: Confirmation message with the updated contacts' details.
+    """
+    logger.info("[batch_update_contact_emails] Invoked. Email: '%s', Resources: '%s'", user_google_email, list(updates))
+
+    if not updates:
+        raise Exception("At least one contact update must be provided.")
+    if len(updates) > 200:
+        raise Exception("A maximum of 200 contacts can be updated per batch.")
+
+    people = service.people()
+
+    # Fetch the current etags and email addresses for all contacts in one request
+    batch_response = await asyncio.to_thread(
+        people.getBatchGet(
+            resourceNames=list(updates),
+            personFields=EMAIL_UPDATE_GET_FIELDS
+        ).execute
+    )
+
+    contacts = {}
+    for entry in batch_response.get("responses", []):
+        resource_name = entry.get("requestedResourceName")
+        person = entry.get("person", {})
+        etag = person.get("etag")
+        if not etag:
+            status_message = entry.get("status", {}).get("message")
+            reason = f": {status_message}" if status_message else ""
+            raise Exception(f"Could not retrieve etag for contact '{resource_name}'{reason}. Update failed.")
+        contacts[resource_name] = {
+            "etag": etag,
+            "emailAddresses": person.get("emailAddresses", []) + [{"value": updates[resource_name]}]
+        }
+
+    response = await asyncio.to_thread(
+        people.batchUpdateContacts(
+            body={
+                "contacts": contacts,
+                "updateMask": EMAIL_UPDATE_FIELDS,
+                "readMask": CONTACT_READ_MASK,
+            }
+        ).execute
+    )
+
+    update_result = response.get("updateResult", {})
+    for result in update_result.values():
+        _cache_contact(user_google_email, result.get("person", {}))
+    contact_list = [
+        _format_contact_details(result.get("person", {}))
+        for result in update_result.values()
+    ]
+    return (
+        f"Successfully updated {len(contact_list)} contacts for {user_google_email}:\n"
+        + "\n".join(contact_list)
+    )
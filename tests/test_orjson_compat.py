@@ -0,0 +1,29 @@
+import json
+
+import pytest
+
+orjson = pytest.importorskip("orjson")
+model = pytest.importorskip("googleapiclient.model")
+
+from core.utils import _OrjsonCompat  # noqa: E402
+
+
+@pytest.fixture
+def orjson_json_model(monkeypatch):
+    monkeypatch.setattr(model, "json", _OrjsonCompat(orjson, json))
+    return model.JsonModel(data_wrapper=False)
+
+
+def test_serialize_escapes_non_ascii(orjson_json_model):
+    body = {"names": [{"givenName": "José 李"}]}
+
+    serialized = orjson_json_model.serialize(body)
+
+    assert serialized.isascii()
+    assert json.loads(serialized) == body
+
+
+def test_deserialize_uses_orjson(orjson_json_model):
+    content = '{"names": [{"givenName": "José 李"}]}'.encode("utf-8")
+
+    assert orjson_json_model.deserialize(content) == {"names": [{"givenName": "José 李"}]}